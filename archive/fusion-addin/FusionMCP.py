@@ -1,7 +1,10 @@
 ﻿import adsk.core
 import adsk.fusion
 import traceback
+import base64
 import json
+import os
+import tempfile
 import time
 import threading
 from pathlib import Path
@@ -10,19 +13,35 @@ app = None
 ui = None
 stop_thread = False
 monitor_thread = None
+heartbeat_thread = None
+document_name = None
 
 COMM_DIR = Path.home() / "fusion_mcp_comm"
+# Each Fusion instance gets its own command directory so one MCP server can
+# route sessions and parallel jobs across several instances
+INSTANCE_DIR = COMM_DIR / "instances" / str(os.getpid())
+HEARTBEAT_INTERVAL = 5  # seconds between endpoint.json refreshes
+
+# Bumped by every command that may change the design; part of the
+# capture_view cache key together with the camera
+design_revision = 0
+READ_ONLY_TOOLS = {'get_design_info', 'get_body_info', 'list_components', 'measure',
+                   'measure_many', 'fit_view', 'capture_view'}
 
 def run(context):
-    global app, ui, monitor_thread, stop_thread
+    global app, ui, monitor_thread, heartbeat_thread, stop_thread
     try:
         app = adsk.core.Application.get()
         ui = app.userInterface
-        COMM_DIR.mkdir(exist_ok=True)
+        INSTANCE_DIR.mkdir(parents=True, exist_ok=True)
+        update_document_name()
+        write_heartbeat()
         stop_thread = False
         monitor_thread = threading.Thread(target=monitor_commands, daemon=True)
         monitor_thread.start()
-        ui.messageBox('Fusion MCP Started!\n\nListening at:\n' + str(COMM_DIR))
+        heartbeat_thread = threading.Thread(target=heartbeat_loop, daemon=True)
+        heartbeat_thread.start()
+        ui.messageBox('Fusion MCP Started!\n\nListening at:\n' + str(INSTANCE_DIR))
     except:
         if ui:
             ui.messageBox('Failed:\n' + traceback.format_exc())
@@ -31,34 +50,86 @@ def stop(context):
     global stop_thread, ui
     try:
         stop_thread = True
+        # A heartbeat written after the unlink would bring the endpoint back
+        if heartbeat_thread:
+            heartbeat_thread.join(timeout=2)
+        (INSTANCE_DIR / "endpoint.json").unlink()
+    except:
+        pass
+    try:
         if ui:
             ui.messageBox('Fusion MCP Stopped')
     except:
         pass
 
+def update_document_name():
+    # Called between commands only, so the heartbeat thread never touches the
+    # Fusion API while a command is running
+    global document_name
+    try:
+        document = app.activeDocument
+        document_name = document.name if document else None
+    except:
+        pass
+
+def write_heartbeat():
+    # The server deletes instance directories it believes are dead
+    INSTANCE_DIR.mkdir(parents=True, exist_ok=True)
+    write_response(INSTANCE_DIR / "endpoint.json", {
+        "pid": os.getpid(),
+        "document": document_name,
+        "updated": time.time(),
+    })
+
+def heartbeat_loop():
+    # Own thread: a long command (large copy_bodies, export) must not make
+    # the instance look dead to the server
+    while not stop_thread:
+        try:
+            write_heartbeat()
+        except:
+            pass
+        for _ in range(HEARTBEAT_INTERVAL * 10):
+            if stop_thread:
+                return
+            time.sleep(0.1)
+
 def monitor_commands():
     global stop_thread
     while not stop_thread:
         try:
-            cmd_files = list(COMM_DIR.glob("command_*.json"))
+            cmd_files = list(INSTANCE_DIR.glob("command_*.json"))
             for cmd_file in cmd_files:
                 try:
                     with open(cmd_file, 'r') as f:
                         command = json.load(f)
+                    resp_file = INSTANCE_DIR / f"response_{command['id']}.json"
+                    if resp_file.exists():
+                        continue  # answered, server has not cleaned up yet
                     result = execute_command(command)
-                    resp_file = COMM_DIR / f"response_{command['id']}.json"
-                    with open(resp_file, 'w') as f:
-                        json.dump(result, f, indent=2)
+                    write_response(resp_file, result)
                 except Exception as e:
                     pass
+            if cmd_files:
+                update_document_name()
             time.sleep(0.1)
         except:
             pass
 
+def write_response(resp_file, result):
+    # Compact JSON, written to a temp file and renamed so the server never
+    # reads a half-written response (large get_body_info payloads)
+    tmp_file = resp_file.with_suffix('.tmp')
+    with open(tmp_file, 'w') as f:
+        json.dump(result, f, separators=(',', ':'))
+    os.replace(tmp_file, resp_file)
+
 def execute_command(command):
-    global app
+    global app, design_revision
     tool_name = command.get('name')
     params = command.get('params', {})
+    if tool_name not in READ_ONLY_TOOLS:
+        design_revision += 1
     try:
         design = app.activeProduct
         if not design:
@@ -83,6 +154,18 @@ def execute_command(command):
             return fit_view(design, rootComp, params)
         elif tool_name == 'get_design_info':
             return get_design_info(design, rootComp, params)
+        elif tool_name == 'get_body_info':
+            return get_body_info(design, rootComp, params)
+        elif tool_name == 'list_components':
+            return list_components(design, rootComp, params)
+        elif tool_name == 'measure':
+            return measure(design, rootComp, params)
+        elif tool_name == 'measure_many':
+            return measure_many(design, rootComp, params)
+        elif tool_name == 'copy_bodies':
+            return copy_bodies(design, rootComp, params)
+        elif tool_name == 'capture_view':
+            return capture_view(design, rootComp, params)
         else:
             return {"success": False, "error": f"Unknown tool: {tool_name}"}
     except Exception as e:
@@ -161,7 +244,11 @@ def add_fillet(design, rootComp, params):
 
 def finish_sketch(design, rootComp, params):
     design.activeEditObject = None
-    return {"success": True, "message": "Sketch finished"}
+    result = {"success": True, "message": "Sketch finished"}
+    if rootComp.sketches.count > 0:
+        # Lets the server validate extrude profile_index without a round-trip
+        result["profile_count"] = rootComp.sketches.item(rootComp.sketches.count - 1).profiles.count
+    return result
 
 def fit_view(design, rootComp, params):
     global app
@@ -175,3 +262,334 @@ def get_design_info(design, rootComp, params):
         "body_count": rootComp.bRepBodies.count,
         "sketch_count": rootComp.sketches.count
     }
+
+# =============================================================================
+# INSPECTION (field selection, filters, pagination)
+# =============================================================================
+
+def _point(p):
+    return [p.x, p.y, p.z] if p else None
+
+def _geometry_type(entity):
+    # 'adsk::core::Plane' -> 'Plane'
+    return entity.geometry.objectType.split('::')[-1]
+
+def _face_normal(face):
+    ok, normal = face.evaluator.getNormalAtPoint(face.pointOnFace)
+    return [normal.x, normal.y, normal.z] if ok else None
+
+def _bounding_box(box):
+    return {"min": _point(box.minPoint), "max": _point(box.maxPoint)}
+
+EDGE_FIELDS = {
+    'index': lambda edge, i: i,
+    'length': lambda edge, i: edge.length,
+    'type': lambda edge, i: _geometry_type(edge),
+    'start': lambda edge, i: _point(edge.startVertex.geometry) if edge.startVertex else None,
+    'end': lambda edge, i: _point(edge.endVertex.geometry) if edge.endVertex else None,
+}
+
+FACE_FIELDS = {
+    'index': lambda face, i: i,
+    'area': lambda face, i: face.area,
+    'type': lambda face, i: _geometry_type(face),
+    'normal': lambda face, i: _face_normal(face),
+    'centroid': lambda face, i: _point(face.centroid),
+    'edge_count': lambda face, i: face.edges.count,
+}
+
+COMPONENT_FIELDS = {
+    'index': lambda occ, i: i,
+    'name': lambda occ, i: occ.component.name,
+    'position': lambda occ, i: _point(occ.transform2.translation),
+    'bounding_box': lambda occ, i: _bounding_box(occ.boundingBox),
+    'body_count': lambda occ, i: occ.bRepBodies.count,
+}
+
+def _matches(value, condition):
+    """Filter condition: a literal (equality) or a dict of min/max/contains."""
+    if not isinstance(condition, dict):
+        return value == condition
+    if value is None:
+        return False
+    if 'min' in condition and value < condition['min']:
+        return False
+    if 'max' in condition and value > condition['max']:
+        return False
+    if 'contains' in condition and str(condition['contains']) not in str(value):
+        return False
+    return True
+
+def select_records(items, getters, params, default_fields):
+    """
+    Apply field selection, filters and cursor pagination to a collection.
+
+    Filter fields are evaluated for every item; the remaining selected fields
+    are only evaluated for the returned page. 'index' is always returned and
+    is the position in the unfiltered collection, so it stays valid for
+    fillet/chamfer/shell.
+
+    Returns (records, matched_count, next_cursor).
+    """
+    fields = params.get('fields') or default_fields
+    if 'index' in getters and 'index' not in fields:
+        fields = ['index'] + list(fields)
+    filters = params.get('filters') or {}
+    unknown = [f for f in list(fields) + list(filters) if f not in getters]
+    if unknown:
+        raise ValueError(f"Unknown fields {unknown}; available: {sorted(getters)}")
+
+    matched = []
+    for i, item in enumerate(items):
+        row = {}
+        for name, condition in filters.items():
+            row[name] = getters[name](item, i)
+            if not _matches(row[name], condition):
+                break
+        else:
+            matched.append((i, item, row))
+
+    cursor = int(params.get('cursor') or 0)
+    limit = params.get('limit')
+    # limit=0 would hand back the same cursor forever, a negative one go backwards
+    if cursor < 0:
+        raise ValueError(f"cursor must be >= 0, got {cursor}")
+    if limit is not None and int(limit) < 1:
+        raise ValueError(f"limit must be >= 1, got {limit}")
+    end = len(matched) if limit is None else min(len(matched), cursor + int(limit))
+    rows = []
+    for i, item, row in matched[cursor:end]:
+        rows.append({f: row[f] if f in row else getters[f](item, i) for f in fields})
+
+    if params.get('columnar'):
+        records = {f: [row[f] for row in rows] for f in fields}
+    else:
+        records = rows
+    next_cursor = end if end < len(matched) else None
+    return records, len(matched), next_cursor
+
+def get_body(rootComp, params):
+    bodies = rootComp.bRepBodies
+    index = params.get('body_index')
+    if index is None:
+        index = bodies.count - 1
+    if index < 0 or index >= bodies.count:
+        return None
+    return bodies.item(index)
+
+def get_body_info(design, rootComp, params):
+    body = get_body(rootComp, params)
+    if not body:
+        return {"success": False, "error": "No body at that index"}
+    include = params.get('include') or ['edges', 'faces']
+    fields = params.get('fields')
+    filters = params.get('filters') or {}
+    unknown = [f for f in list(fields or []) + list(filters)
+               if f not in EDGE_FIELDS and f not in FACE_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields {unknown}; edges: {sorted(EDGE_FIELDS)}, faces: {sorted(FACE_FIELDS)}")
+
+    result = {"success": True, "body_name": body.name}
+    next_cursors = []
+    selected = []
+    for section, collection, getters, defaults in (
+            ('edges', body.edges, EDGE_FIELDS, ['index', 'length']),
+            ('faces', body.faces, FACE_FIELDS, ['index', 'area'])):
+        # fields=['area', 'normal'] only makes sense for faces: a section is
+        # skipped when none of the requested fields or a filter field is its own
+        section_fields = [f for f in fields if f in getters] if fields else defaults
+        if section not in include or not section_fields:
+            continue
+        if section_fields == ['index'] and fields != ['index']:
+            continue
+        if any(f not in getters for f in filters):
+            continue
+        selected.append(section)
+        section_params = dict(params, fields=section_fields)
+        records, count, next_cursor = select_records(collection, getters, section_params, defaults)
+        result[section] = records
+        result[section[:-1] + '_count'] = count
+        if next_cursor is not None:
+            next_cursors.append(next_cursor)
+    if not selected:
+        raise ValueError(f"fields {fields} and filters {list(filters)} do not select any of {include}: "
+                         f"edges: {sorted(EDGE_FIELDS)}, faces: {sorted(FACE_FIELDS)}")
+    result["next_cursor"] = max(next_cursors) if next_cursors else None
+    return result
+
+def list_components(design, rootComp, params):
+    records, count, next_cursor = select_records(
+        rootComp.occurrences, COMPONENT_FIELDS, params,
+        ['index', 'name', 'position', 'bounding_box'])
+    return {"success": True, "components": records, "component_count": count,
+            "next_cursor": next_cursor}
+
+# =============================================================================
+# MEASUREMENT
+# =============================================================================
+
+# (body entityToken, body revisionId) -> measured body properties.
+# revisionId changes whenever the body is modified, so entries never go stale;
+# the cache is simply dropped once it grows past PHYSICAL_CACHE_SIZE.
+physical_cache = {}
+PHYSICAL_CACHE_SIZE = 256
+
+def body_properties(body):
+    key = (body.entityToken, body.revisionId)
+    props = physical_cache.get(key)
+    if props is None:
+        if len(physical_cache) >= PHYSICAL_CACHE_SIZE:
+            physical_cache.clear()
+        phys = body.physicalProperties
+        box = body.boundingBox
+        props = {
+            "volume": phys.volume,
+            "surface_area": phys.area,
+            "mass": phys.mass,
+            "center_of_mass": _point(phys.centerOfMass),
+            "bounding_box": {
+                "min": _point(box.minPoint),
+                "max": _point(box.maxPoint),
+                "size": [box.maxPoint.x - box.minPoint.x,
+                         box.maxPoint.y - box.minPoint.y,
+                         box.maxPoint.z - box.minPoint.z],
+            },
+        }
+        physical_cache[key] = props
+    return props
+
+def _indexed(collection, index, what):
+    if index is None or index < 0 or index >= collection.count:
+        raise ValueError(f"Invalid {what} index: {index}")
+    return collection.item(index)
+
+def _min_distance(entities1, entities2):
+    best = None
+    for e1 in entities1:
+        for e2 in entities2:
+            res = app.measureManager.measureMinimumDistance(e1, e2)
+            if best is None or res.value < best.value:
+                best = res
+    if best is None:
+        raise ValueError("Nothing to measure")
+    return {"distance": best.value,
+            "point1": _point(best.positionOne),
+            "point2": _point(best.positionTwo)}
+
+def measure_query(rootComp, query):
+    kind = query.get('type', 'body')
+    if kind in ('body', 'edge', 'face'):
+        body = get_body(rootComp, query)
+        if not body:
+            raise ValueError("No body at that index")
+        if kind == 'body':
+            return dict(body_properties(body))
+        if kind == 'edge':
+            return {"length": _indexed(body.edges, query.get('edge_index'), 'edge').length}
+        return {"area": _indexed(body.faces, query.get('face_index'), 'face').area}
+    if kind == 'min_distance':
+        if 'component1_index' in query or 'component2_index' in query:
+            occ1 = _indexed(rootComp.occurrences, query.get('component1_index'), 'component')
+            occ2 = _indexed(rootComp.occurrences, query.get('component2_index'), 'component')
+            return _min_distance(occ1.bRepBodies, occ2.bRepBodies)
+        body1 = _indexed(rootComp.bRepBodies, query.get('body1_index'), 'body')
+        body2 = _indexed(rootComp.bRepBodies, query.get('body2_index'), 'body')
+        return _min_distance([body1], [body2])
+    raise ValueError(f"Unknown measure type: {kind}")
+
+def measure_many(design, rootComp, params):
+    results = []
+    for query in params.get('queries', []):
+        try:
+            results.append(measure_query(rootComp, query))
+        except Exception as e:
+            results.append({"error": str(e)})
+    return {"success": True, "results": results}
+
+def measure(design, rootComp, params):
+    result = measure_query(rootComp, params)
+    result["success"] = True
+    return result
+
+# =============================================================================
+# BULK COPIES (expanded patterns/mirror from the server)
+# =============================================================================
+
+def copy_bodies(design, rootComp, params):
+    """Add one transformed copy of a body per 16-value row-major matrix"""
+    body = get_body(rootComp, params)
+    if not body:
+        return {"success": False, "error": "No body at that index"}
+    tbm = adsk.fusion.TemporaryBRepManager.get()
+    matrix = adsk.core.Matrix3D.create()
+    # All copies go into one base feature: a single timeline entry instead of
+    # hundreds of pattern instances
+    base = None
+    if design.designType == adsk.fusion.DesignTypes.ParametricDesignType:
+        base = rootComp.features.baseFeatures.add()
+        base.startEdit()
+    try:
+        for values in params['transforms']:
+            copy = tbm.copy(body)
+            matrix.setWithArray(values)
+            tbm.transform(copy, matrix)
+            if base:
+                rootComp.bRepBodies.add(copy, base)
+            else:
+                rootComp.bRepBodies.add(copy)
+    finally:
+        if base:
+            base.finishEdit()
+    return {"success": True, "bodies_created": len(params['transforms']),
+            "instance_count": len(params['transforms']) + 1}
+
+# =============================================================================
+# VIEW CAPTURE
+# =============================================================================
+
+def _timeline_state(design):
+    # Catches edits and undos made in the Fusion UI, which design_revision misses
+    try:
+        return f"{design.timeline.count}.{design.timeline.markerPosition}"
+    except:
+        return ""
+
+def view_revision(design):
+    return f"{design.parentDocument.name}|{design_revision}|{_timeline_state(design)}"
+
+def view_key(design, params):
+    camera = app.activeViewport.camera
+    vectors = [camera.eye, camera.target, camera.upVector]
+    coords = ",".join(f"{v:.4f}" for p in vectors for v in (p.x, p.y, p.z))
+    return (f"{view_revision(design)}|{coords},{camera.viewExtents:.4f}|"
+            f"{params['width']}x{params['height']}.{params['format']}")
+
+def capture_view(design, rootComp, params):
+    """
+    Render the active viewport. Returns the image base64-encoded, or only
+    the key when it is in the server's cached_keys (same design revision,
+    camera and size), or writes to filepath when given. The design part of
+    the key is also returned as revision.
+    """
+    key = view_key(design, params)
+    revision = view_revision(design)
+    if key in params.get('cached_keys', []):
+        return {"success": True, "key": key, "revision": revision, "cached": True}
+    filepath = params.get('filepath')
+    if filepath:
+        if not app.activeViewport.saveAsImageFile(filepath, params['width'], params['height']):
+            return {"success": False, "error": f"Could not save image to {filepath}"}
+        return {"success": True, "key": key, "revision": revision, "filepath": filepath}
+
+    # saveAsImageFile only writes files; keep the temp file off the comm dir
+    fd, tmp_path = tempfile.mkstemp(suffix='.' + params['format'])
+    os.close(fd)
+    try:
+        if not app.activeViewport.saveAsImageFile(tmp_path, params['width'], params['height']):
+            return {"success": False, "error": "Viewport capture failed"}
+        with open(tmp_path, 'rb') as f:
+            data = f.read()
+    finally:
+        os.remove(tmp_path)
+    return {"success": True, "key": key, "revision": revision,
+            "image": base64.b64encode(data).decode('ascii')}
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the Fusion 360 MCP server.
+==========================================
+    python bench.py startup [--runs 10]
+    python bench.py patterns [--counts 10 50 200 1000] [--live]
+
+startup: spawns the server over stdio like an MCP client does and times
+  - initialize   (process launch to first response, target < 150ms)
+  - tools/list   (answered from the schema cache)
+  - first tools/call (FastMCP hand-off; uses a call the server rejects
+    locally, so no Fusion instance is needed)
+Runs in a scratch HOME so the first run is a cold start (schema cache is
+built) and the rest are warm.
+
+patterns: compares feature-based and expanded pattern_rectangular. Always
+reports the server-side cost of expansion (NumPy transforms + JSON payload);
+with --live it also times both modes end to end against the running Fusion
+instance (or mock_addin.py), undoing each pattern afterwards.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SERVER = Path(__file__).with_name("fusion360_mcp_server.py")
+STARTUP_TARGET_MS = 150
+
+def _startup_once(env: dict) -> dict:
+    proc = subprocess.Popen([sys.executable, str(SERVER)], env=env,
+                            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+
+    def request(message: dict) -> float:
+        start = time.perf_counter()
+        proc.stdin.write((json.dumps(message) + "\n").encode("utf-8"))
+        proc.stdin.flush()
+        if "id" in message:
+            proc.stdout.readline()
+        return (time.perf_counter() - start) * 1000
+
+    try:
+        launched = time.perf_counter()
+        request({"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {
+            "protocolVersion": "2024-11-05", "capabilities": {},
+            "clientInfo": {"name": "bench", "version": "0"}}})
+        timings = {"initialize": (time.perf_counter() - launched) * 1000}
+        request({"jsonrpc": "2.0", "method": "notifications/initialized"})
+        timings["tools/list"] = request({"jsonrpc": "2.0", "id": 2, "method": "tools/list"})
+        timings["first tools/call"] = request({"jsonrpc": "2.0", "id": 3, "method": "tools/call", "params": {
+            "name": "draw_circle", "arguments": {"center_x": 0, "center_y": 0, "radius": 0}}})
+        return timings
+    finally:
+        proc.kill()
+        proc.wait()
+
+def bench_startup(runs: int):
+    with tempfile.TemporaryDirectory() as home:
+        env = dict(os.environ, HOME=home, USERPROFILE=home)
+        cold = _startup_once(env)
+        warm = [_startup_once(env) for _ in range(runs)]
+    print(f"{'':18} {'cold':>8} {'warm median':>12} {'warm max':>9}")
+    for name in cold:
+        values = [w[name] for w in warm]
+        print(f"{name:18} {cold[name]:7.1f}ms {statistics.median(values):10.1f}ms {max(values):7.1f}ms")
+    median = statistics.median(w["initialize"] for w in warm)
+    verdict = "OK" if median < STARTUP_TARGET_MS else "OVER TARGET"
+    print(f"\nwarm initialize {median:.1f}ms vs target {STARTUP_TARGET_MS}ms: {verdict}")
+    return median < STARTUP_TARGET_MS
+
+def bench_patterns(counts: list, live: bool):
+    sys.path.insert(0, str(SERVER.parent))
+    import fusion360_mcp_server as server
+    np = server._numpy()
+    if np is None:
+        sys.exit("patterns benchmark needs NumPy")
+
+    print(f"{'instances':>9} {'expand':>9} {'payload':>10}" + (f" {'feature':>10} {'expanded':>10}" if live else ""))
+    for count in counts:
+        params = {"x_count": count, "x_spacing": 1.0, "mode": "expanded"}
+        start = time.perf_counter()
+        _, expanded, _ = server.expand_pattern("pattern_rectangular", params)
+        payload = len(json.dumps(expanded))
+        row = f"{count:9d} {(time.perf_counter() - start) * 1000:7.2f}ms {payload / 1024:8.1f}KB"
+        if live:
+            for mode in ("feature", "expanded"):
+                start = time.perf_counter()
+                try:
+                    server.pattern_rectangular(x_count=count, x_spacing=1.0, mode=mode)
+                    row += f" {(time.perf_counter() - start) * 1000:8.0f}ms"
+                    server.undo(1)
+                except Exception as e:
+                    row += f" {'error':>10}"
+                    print(f"  {mode} x{count}: {e}", file=sys.stderr)
+        print(row)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    sub = parser.add_subparsers(dest="bench", required=True)
+    startup = sub.add_parser("startup", help="time to first response and tool listing")
+    startup.add_argument("--runs", type=int, default=10)
+    patterns = sub.add_parser("patterns", help="feature-based vs expanded patterns")
+    patterns.add_argument("--counts", type=int, nargs="+", default=[10, 50, 200, 1000])
+    patterns.add_argument("--live", action="store_true", help="also time both modes against Fusion")
+    args = parser.parse_args()
+    if args.bench == "startup":
+        sys.exit(0 if bench_startup(args.runs) else 1)
+    if args.bench == "patterns":
+        bench_patterns(args.counts, args.live)
+
+if __name__ == "__main__":
+    main()
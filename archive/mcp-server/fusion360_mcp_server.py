@@ -27,24 +27,48 @@ PRESERVED:
   o 45s timeout
   o All v6.0 features
 """
-from mcp.server.fastmcp import FastMCP
+# Startup is kept cheap: MCP clients spawn this process per session, and
+# importing the mcp package alone costs ~0.5s. See STARTUP at the bottom.
+import base64
+import copy
+import itertools
 import json
+import math
+import os
+import shutil
+import sys
+import threading
 import time
 from pathlib import Path
 
 COMM_DIR = Path.home() / "fusion_mcp_comm"
-COMM_DIR.mkdir(exist_ok=True)
+SERVER_NAME = "Fusion 360 v7.2 Enhanced"
 
-mcp = FastMCP("Fusion 360 v7.2 Enhanced")
+mcp = None      # FastMCP instance, built on demand by create_server()
+TOOLS = []      # tool functions in registration order
+
+def tool(fn):
+    """Register an MCP tool without importing FastMCP"""
+    TOOLS.append(fn)
+    return fn
+
+_command_ids = itertools.count()
 
 def send_fusion_command(tool_name: str, params: dict) -> dict:
+    """Validate against the local design model, then send to Fusion 360"""
+    endpoint = pool.for_session(_session_key())
+    with endpoint.lock:
+        return endpoint.send(tool_name, params)
+
+def _round_trip(comm_dir: Path, tool_name: str, params: dict) -> dict:
     """Send command to Fusion 360 via file system"""
-    timestamp = int(time.time() * 1000)
-    cmd_file = COMM_DIR / f"command_{timestamp}.json"
-    resp_file = COMM_DIR / f"response_{timestamp}.json"
+    # Millisecond timestamps alone collide when several sessions share a host
+    command_id = f"{int(time.time() * 1000)}_{next(_command_ids)}"
+    cmd_file = comm_dir / f"command_{command_id}.json"
+    resp_file = comm_dir / f"response_{command_id}.json"
     
     with open(cmd_file, 'w') as f:
-        json.dump({"type": "tool", "name": tool_name, "params": params, "id": timestamp}, f)
+        json.dump({"type": "tool", "name": tool_name, "params": params, "id": command_id}, f)
     
     # 900 iterations at 50ms = 45s timeout
     for _ in range(900):
@@ -61,13 +85,559 @@ def send_fusion_command(tool_name: str, params: dict) -> dict:
                 raise Exception(result.get("error", "Unknown error"))
             return result
     
-    raise Exception("Timeout after 45s - is Fusion 360 running with FusionMCP add-in?")
+    try:
+        cmd_file.unlink()
+    except:
+        pass
+    raise Exception(f"Timeout after 45s - is Fusion 360 running with FusionMCP add-in? ({comm_dir})")
+
+def _selection_params(fields, filters, cursor, limit, columnar) -> dict:
+    """Field selection / filter / pagination params shared by inspection tools"""
+    params = {}
+    if fields is not None:
+        params["fields"] = fields
+    if filters is not None:
+        params["filters"] = filters
+    if cursor is not None:
+        if cursor < 0:
+            raise ValueError(f"cursor must be >= 0, got {cursor}")
+        params["cursor"] = cursor
+    if limit is not None:
+        if limit < 1:
+            raise ValueError(f"limit must be >= 1, got {limit}")
+        params["limit"] = limit
+    if columnar:
+        params["columnar"] = True
+    return params
+
+# =============================================================================
+# PRE-VALIDATION (local design model)
+# =============================================================================
+
+PLANES = ("XY", "XZ", "YZ")
+AXES = ("X", "Y", "Z")
+LATEST = -1  # body key when body_index is omitted and the body count is unknown
+EPSILON = 1e-9
+
+# Commands that never change sketches or body topology
+READ_ONLY_TOOLS = {
+    "get_design_info", "get_body_info", "list_components", "measure", "measure_many",
+    "fit_view", "check_interference", "move_component", "rotate_component",
+    "create_revolute_joint", "create_slider_joint", "set_joint_angle", "set_joint_distance",
+    "export_stl", "export_step", "export_3mf", "capture_view",
+}
+# Commands that replace the topology of one existing body
+BODY_EDIT_TOOLS = {"fillet", "chamfer", "shell", "draft"}
+SKETCH_TOOLS = {"draw_rectangle", "draw_circle", "draw_line", "draw_arc", "draw_polygon"}
+
+class DesignModel:
+    """
+    What the server knows about the active design, learned from earlier
+    commands and responses. Every fact may be None (unknown); validation only
+    rejects a command on known facts, so a freshly started server never
+    blocks anything it cannot prove wrong.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.sketch_active = None
+        self.profile_count = None   # profiles in the most recent finished sketch
+        self.body_count = None
+        self.bodies = {}            # body key -> {"edges": {index: length}, "edge_count", "face_count", "size"}
+        self._warnings = []
+
+    # -- validation ---------------------------------------------------------
+
+    def check(self, tool_name: str, params: dict):
+        """
+        Return (params, corrections, warnings) or raise ValueError before any
+        round-trip. Warnings flag likely problems the model cannot prove.
+        """
+        if tool_name == "batch":
+            # Validate in order, assuming each earlier command succeeds
+            commands, corrections, warnings = [], [], []
+            saved = copy.deepcopy(self.__dict__)
+            for i, command in enumerate(params.get("commands", [])):
+                try:
+                    cmd_params, notes, cmd_warnings = self.check(command.get("name"), command.get("params", {}))
+                except ValueError as e:
+                    self.__dict__ = saved  # nothing was sent
+                    raise ValueError(f"batch command {i}: {e}") from None
+                commands.append(dict(command, params=cmd_params))
+                corrections += [f"batch command {i}: {note}" for note in notes]
+                warnings += [f"batch command {i}: {note}" for note in cmd_warnings]
+                self.observe(command.get("name"), cmd_params, {})
+            return dict(params, commands=commands), corrections, warnings
+
+        check = getattr(self, f"_check_{tool_name}", None)
+        if tool_name in SKETCH_TOOLS and self.sketch_active is False:
+            raise ValueError(f"{tool_name}: no active sketch - call create_sketch first")
+        params = dict(params)
+        self._warnings = []
+        try:
+            self._check_body_index(tool_name, params)
+            corrections = check(params) if check else None
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"{tool_name}: missing or invalid parameter {e}") from None
+        return params, corrections or [], self._warnings
+
+    def _check_body_index(self, tool_name: str, params: dict):
+        index = params.get("body_index")
+        if index is None:
+            return
+        if not isinstance(index, int) or isinstance(index, bool):
+            raise ValueError(f"{tool_name}: body_index must be an integer, got {index!r}")
+        if index < 0 or (self.body_count is not None and index >= self.body_count):
+            raise ValueError(f"{tool_name}: body_index {index} out of range (body count: {self.body_count})")
+
+    def _body(self, params: dict):
+        return self.bodies.get(self._body_key(params), {})
+
+    def _body_key(self, params: dict):
+        if params.get("body_index") is not None:
+            return params["body_index"]
+        return self.body_count - 1 if self.body_count else LATEST
+
+    def _check_indices(self, tool_name: str, indices, count, what: str):
+        if indices is None or count is None:
+            return
+        bad = [i for i in indices if i < 0 or i >= count]
+        if bad:
+            raise ValueError(f"{tool_name}: {what} indices {bad} out of range (body has {count} {what}s)")
+
+    def _check_create_sketch(self, p):
+        if p.get("plane") not in PLANES:
+            raise ValueError(f"create_sketch: plane must be one of {PLANES}, got {p.get('plane')!r}")
+
+    def _check_draw_rectangle(self, p):
+        if abs(p["x1"] - p["x2"]) < EPSILON or abs(p["y1"] - p["y2"]) < EPSILON:
+            raise ValueError("draw_rectangle: degenerate rectangle (x1 == x2 or y1 == y2)")
+
+    def _check_draw_circle(self, p):
+        if p["radius"] <= 0:
+            raise ValueError(f"draw_circle: radius must be positive, got {p['radius']}")
+
+    def _check_draw_line(self, p):
+        if math.hypot(p["x2"] - p["x1"], p["y2"] - p["y1"]) < EPSILON:
+            raise ValueError("draw_line: start and end points coincide")
+
+    def _check_draw_polygon(self, p):
+        if p["radius"] <= 0:
+            raise ValueError(f"draw_polygon: radius must be positive, got {p['radius']}")
+        if p.get("sides", 6) < 3:
+            raise ValueError(f"draw_polygon: needs at least 3 sides, got {p['sides']}")
+
+    def _check_draw_arc(self, p):
+        cx, cy = p["center_x"], p["center_y"]
+        radius = math.hypot(p["start_x"] - cx, p["start_y"] - cy)
+        if radius < EPSILON:
+            raise ValueError("draw_arc: start point coincides with center")
+        end = math.hypot(p["end_x"] - cx, p["end_y"] - cy)
+        if end < EPSILON:
+            raise ValueError("draw_arc: end point coincides with center")
+        if abs(end - radius) > EPSILON:
+            # Project the end point onto the arc's circle
+            p["end_x"] = cx + (p["end_x"] - cx) * radius / end
+            p["end_y"] = cy + (p["end_y"] - cy) * radius / end
+            return [f"draw_arc: end point moved to ({p['end_x']:.6g}, {p['end_y']:.6g}) to lie on radius {radius:.6g}"]
+
+    def _check_extrude(self, p):
+        if p["distance"] == 0:
+            raise ValueError("extrude: distance must be non-zero")
+        index = p.get("profile_index", 0)
+        if index < 0:
+            raise ValueError(f"extrude: profile_index must be >= 0, got {index}")
+        if self.profile_count == 0:
+            raise ValueError("extrude: the last sketch has no closed profiles")
+        if self.profile_count is not None and index >= self.profile_count:
+            raise ValueError(f"extrude: profile_index {index} out of range (sketch has {self.profile_count} profiles)")
+
+    def _check_revolve(self, p):
+        if p["angle"] == 0 or abs(p["angle"]) > 360:
+            raise ValueError(f"revolve: angle must be in (0, 360] degrees, got {p['angle']}")
+        if self.profile_count == 0:
+            raise ValueError("revolve: the last sketch has no closed profiles")
+
+    def _check_edge_feature(self, tool_name, p, size_key):
+        size = p[size_key]
+        if size <= 0:
+            raise ValueError(f"{tool_name}: {size_key} must be positive, got {size}")
+        body = self._body(p)
+        self._check_indices(tool_name, p.get("edges"), body.get("edge_count"), "edge")
+        lengths = body.get("edges", {})
+        targets = p.get("edges")
+        if targets is None:
+            # All edges - only decidable once every edge length is known
+            targets = list(lengths) if len(lengths) == body.get("edge_count") else []
+        known = [lengths[i] for i in targets if i in lengths]
+        # The real limit is the width of the adjacent faces, which the model
+        # does not know - a size beyond the edge length is only suspicious
+        if known and size >= min(known):
+            self._warnings.append(f"{tool_name}: {size_key} {size} is not smaller than the shortest selected "
+                                  f"edge ({min(known):.6g}); it may exceed the adjacent faces")
+
+    def _check_fillet(self, p):
+        self._check_edge_feature("fillet", p, "radius")
+
+    def _check_chamfer(self, p):
+        self._check_edge_feature("chamfer", p, "distance")
+
+    def _check_shell(self, p):
+        if p["thickness"] <= 0:
+            raise ValueError(f"shell: thickness must be positive, got {p['thickness']}")
+        body = self._body(p)
+        self._check_indices("shell", p.get("faces_to_remove"), body.get("face_count"), "face")
+        size = body.get("size")
+        # Only a closed shell needs walls on both sides; an open one (faces
+        # removed) can be as thick as the body is deep
+        if size and not p.get("faces_to_remove") and 2 * p["thickness"] >= min(size):
+            raise ValueError(f"shell: closed shell of thickness {p['thickness']} leaves no cavity "
+                             f"in a body only {min(size):.6g} thick")
+
+    def _check_draft(self, p):
+        if not 0 < abs(p["angle"]) < 90:
+            raise ValueError(f"draft: angle must be between 0 and 90 degrees, got {p['angle']}")
+        if math.hypot(p.get("pull_x", 0), p.get("pull_y", 0), p.get("pull_z", 1)) < EPSILON:
+            raise ValueError("draft: pull direction must be non-zero")
+        self._check_indices("draft", p.get("faces"), self._body(p).get("face_count"), "face")
+
+    def _check_pattern_rectangular(self, p):
+        counts = {"x_count": p["x_count"], "y_count": p.get("y_count", 1)}
+        for count, spacing in (("x_count", "x_spacing"), ("y_count", "y_spacing")):
+            if counts[count] < 1:
+                raise ValueError(f"pattern_rectangular: {count} must be >= 1, got {counts[count]}")
+            if counts[count] > 1 and p.get(spacing, 0) == 0:
+                raise ValueError(f"pattern_rectangular: {spacing} must be non-zero when {count} > 1")
+        if counts["x_count"] * counts["y_count"] < 2:
+            raise ValueError("pattern_rectangular: pattern needs at least 2 instances")
+
+    def _check_pattern_circular(self, p):
+        if p["count"] < 2:
+            raise ValueError(f"pattern_circular: count must be >= 2, got {p['count']}")
+        angle = p.get("angle", 360)
+        if angle == 0 or abs(angle) > 360:
+            raise ValueError(f"pattern_circular: angle must be in (0, 360] degrees, got {angle}")
+        if p.get("axis", "Z") not in AXES:
+            raise ValueError(f"pattern_circular: axis must be one of {AXES}, got {p['axis']!r}")
+
+    def _check_mirror(self, p):
+        if p.get("plane", "YZ") not in PLANES:
+            raise ValueError(f"mirror: plane must be one of {PLANES}, got {p['plane']!r}")
+
+    # -- learning -----------------------------------------------------------
+
+    def observe(self, tool_name: str, params: dict, result: dict):
+        """Update the model after a successful command"""
+        if tool_name == "batch":
+            return  # commands were already observed one by one in check()
+        if tool_name == "create_sketch":
+            self.sketch_active, self.profile_count = True, None
+        elif tool_name == "finish_sketch":
+            self.sketch_active = False
+            self.profile_count = result.get("profile_count")
+        elif tool_name in SKETCH_TOOLS:
+            self.sketch_active, self.profile_count = True, None
+        elif tool_name in ("extrude", "revolve"):
+            self.bodies.pop(LATEST, None)
+            if self.body_count is not None:
+                self.body_count += 1
+        elif tool_name == "copy_bodies":
+            self.bodies.pop(LATEST, None)
+            if self.body_count is not None:
+                self.body_count += len(params["transforms"])
+        elif tool_name in BODY_EDIT_TOOLS:
+            self.bodies.pop(self._body_key(params), None)
+            self.bodies.pop(LATEST, None)
+        elif tool_name == "get_design_info":
+            if result.get("body_count") != self.body_count:
+                self.bodies.clear()
+            self.body_count = result.get("body_count")
+        elif tool_name == "get_body_info":
+            self._learn_body_info(params, result)
+        elif tool_name in ("measure", "measure_many"):
+            queries = params.get("queries", [params])
+            for query, res in zip(queries, result.get("results", [result])):
+                if query.get("type", "body") == "body" and "bounding_box" in res:
+                    body = self.bodies.setdefault(self._body_key(query), {})
+                    body["size"] = res["bounding_box"]["size"]
+        elif tool_name not in READ_ONLY_TOOLS:
+            self.reset()
+
+    def _learn_body_info(self, params: dict, result: dict):
+        body = self.bodies.setdefault(self._body_key(params), {})
+        unfiltered = not params.get("filters")
+        for section in ("edges", "faces"):
+            if unfiltered and f"{section[:-1]}_count" in result:
+                body[f"{section[:-1]}_count"] = result[f"{section[:-1]}_count"]
+        edges = result.get("edges")
+        if isinstance(edges, dict):  # columnar
+            edges = [dict(zip(edges, row)) for row in zip(*edges.values())]
+        for edge in edges or []:
+            if "index" in edge and "length" in edge:
+                body.setdefault("edges", {})[edge["index"]] = edge["length"]
+
+# =============================================================================
+# PATTERN EXPANSION (feature-based vs. client-side transforms)
+# =============================================================================
+
+# Fusion pattern features get slow and fragile with hundreds of instances.
+# From EXPAND_THRESHOLD instances on, "auto" computes the instance transforms
+# here with NumPy and sends one copy_bodies command that adds every copy in a
+# single base feature. NumPy is optional: without it "auto" stays feature-based.
+EXPAND_THRESHOLD = 50
+PATTERN_MODES = ("auto", "feature", "expanded")
+AXIS_VECTORS = {"X": (1, 0, 0), "Y": (0, 1, 0), "Z": (0, 0, 1)}
+MIRROR_SCALES = {"YZ": (-1, 1, 1), "XZ": (1, -1, 1), "XY": (1, 1, -1)}
+
+def _numpy():
+    try:
+        import numpy
+        return numpy
+    except ImportError:
+        return None
+
+def rectangular_transforms(np, x_count, x_spacing, y_count=1, y_spacing=0):
+    """4x4 translations for every instance except the original"""
+    ix, iy = np.meshgrid(np.arange(x_count), np.arange(y_count), indexing="ij")
+    offsets = np.stack([ix.ravel() * x_spacing, iy.ravel() * y_spacing], axis=1)[1:]
+    transforms = np.tile(np.eye(4), (len(offsets), 1, 1))
+    transforms[:, 0, 3] = offsets[:, 0]
+    transforms[:, 1, 3] = offsets[:, 1]
+    return transforms
+
+def circular_transforms(np, count, angle=360, axis="Z"):
+    """4x4 rotations about a world axis through the origin, original excluded"""
+    # A full circle spaces instances evenly; a partial angle includes both ends
+    step = angle / count if abs(angle) == 360 else angle / (count - 1)
+    theta = np.radians(step * np.arange(1, count))
+    k = np.array(AXIS_VECTORS[axis], dtype=float)
+    cross = np.array([[0, -k[2], k[1]], [k[2], 0, -k[0]], [-k[1], k[0], 0]])
+    cos, sin = np.cos(theta)[:, None, None], np.sin(theta)[:, None, None]
+    transforms = np.tile(np.eye(4), (len(theta), 1, 1))
+    transforms[:, :3, :3] = cos * np.eye(3) + sin * cross + (1 - cos) * np.outer(k, k)
+    return transforms
+
+def mirror_transforms(np, plane="YZ"):
+    return np.diag(list(MIRROR_SCALES[plane]) + [1.0])[None]
+
+def _pattern_plan(np, tool_name: str, params: dict):
+    """(instance count, transform builder) for an expandable command"""
+    if tool_name == "pattern_rectangular":
+        count = params["x_count"] * params.get("y_count", 1)
+        return count, lambda: rectangular_transforms(
+            np, params["x_count"], params["x_spacing"], params.get("y_count", 1), params.get("y_spacing", 0))
+    if tool_name == "pattern_circular":
+        return params["count"], lambda: circular_transforms(
+            np, params["count"], params.get("angle", 360), params.get("axis", "Z"))
+    return 2, lambda: mirror_transforms(np, params.get("plane", "YZ"))
+
+def expand_pattern(tool_name: str, params: dict):
+    """
+    Pick feature-based or expanded execution for pattern_*/mirror.
+    Returns (tool_name, params, strategy); strategy is None for other commands.
+    """
+    if tool_name == "batch":
+        commands = []
+        for command in params.get("commands", []):
+            name, cmd_params, _ = expand_pattern(command.get("name"), command.get("params", {}))
+            commands.append(dict(command, name=name, params=cmd_params))
+        return tool_name, dict(params, commands=commands), None
+    if tool_name not in ("pattern_rectangular", "pattern_circular", "mirror"):
+        return tool_name, params, None
+
+    params = dict(params)
+    mode = params.pop("mode", "auto")
+    if mode not in PATTERN_MODES:
+        raise ValueError(f"{tool_name}: mode must be one of {PATTERN_MODES}, got {mode!r}")
+    np = _numpy()
+    if mode == "expanded" and np is None:
+        raise ValueError(f"{tool_name}: mode='expanded' needs NumPy (pip install numpy)")
+    count, build = _pattern_plan(np, tool_name, params)
+    if mode == "feature" or (mode == "auto" and (np is None or count < EXPAND_THRESHOLD)):
+        return tool_name, params, "feature"
+
+    transforms = build()
+    expanded = {"transforms": transforms.reshape(len(transforms), 16).tolist()}
+    if params.get("body_index") is not None:
+        expanded["body_index"] = params["body_index"]
+    return "copy_bodies", expanded, "expanded"
+
+# =============================================================================
+# INSTANCE POOL (one add-in endpoint per Fusion instance)
+# =============================================================================
+
+# Each add-in serves COMM_DIR/instances/<id>/ and refreshes endpoint.json as a
+# heartbeat from its own thread, so a busy instance keeps beating. Older
+# add-ins poll COMM_DIR itself, which is used when no instance directory is alive.
+HEARTBEAT_TIMEOUT = 30      # seconds without a heartbeat before an instance is considered gone
+DISCOVERY_INTERVAL = 2      # seconds between instance directory scans
+INSTANCE_CLEANUP_AGE = 600  # seconds before a directory without a live add-in is deleted
+
+def _pid_running(pid) -> bool:
+    """False only if pid is known to have exited (checked on POSIX only)"""
+    if not isinstance(pid, int) or os.name != "posix":
+        return True  # os.kill on Windows terminates the process
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        pass  # exists but belongs to another user
+    return True
+
+class Endpoint:
+    """One Fusion add-in command directory with its own design model"""
+
+    def __init__(self, path: Path, info: dict = None):
+        self.path = path
+        self.info = info or {}
+        self.name = path.name if path != COMM_DIR else "default"
+        self.lock = threading.Lock()
+        self.model = DesignModel()
+        self.views = ViewCache()
+
+    def send(self, tool_name: str, params: dict) -> dict:
+        """Validate, round-trip and learn. Caller must hold self.lock."""
+        params, corrections, warnings = self.model.check(tool_name, params)
+        tool_name, params, strategy = expand_pattern(tool_name, params)
+        try:
+            result = _round_trip(self.path, tool_name, params)
+        except Exception:
+            # Fusion may have partially applied the command - forget what we knew
+            self.model.reset()
+            raise
+        self.model.observe(tool_name, params, result)
+        if corrections:
+            result["corrected"] = corrections
+        if warnings:
+            result["warnings"] = warnings
+        if strategy:
+            result["strategy"] = strategy
+        return result
+
+class EndpointPool:
+    """
+    Routes MCP sessions to Fusion instances. Each session sticks to one
+    endpoint (the least used when it first calls a tool) so its design model
+    stays consistent, and moves only when that instance is gone. run_parallel
+    jobs borrow idle endpoints, preferring ones no session is bound to.
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.instances_dir = root / "instances"
+        self._endpoints = {}       # path -> Endpoint, kept so models survive rescans
+        self._alive = []
+        self._scanned = 0
+        self._sessions = {}        # session key -> Endpoint
+        self._mutex = threading.Lock()
+        self._idle = threading.Condition(self._mutex)
+
+    def endpoints(self) -> list:
+        with self._mutex:
+            return self._discover()
+
+    def _discover(self) -> list:
+        now = time.time()
+        if self._alive and now - self._scanned < DISCOVERY_INTERVAL:
+            return self._alive
+        alive = []
+        for instance in sorted(p for p in self.instances_dir.glob("*") if p.is_dir()):
+            heartbeat = instance / "endpoint.json"
+            try:
+                age = now - heartbeat.stat().st_mtime
+                with open(heartbeat, 'r') as f:
+                    info = json.load(f)
+            except FileNotFoundError:
+                # Stopped cleanly, or the add-in is just starting
+                try:
+                    age, info = now - instance.stat().st_mtime, None
+                except OSError:
+                    continue
+            except (OSError, ValueError):
+                continue  # being rewritten
+            exited = info is not None and not _pid_running(info.get("pid"))
+            if info is None or exited or age > HEARTBEAT_TIMEOUT:
+                # A crashed Fusion never removes its endpoint.json
+                if exited or age > INSTANCE_CLEANUP_AGE:
+                    shutil.rmtree(instance, ignore_errors=True)
+                    self._endpoints.pop(instance, None)
+                continue
+            endpoint = self._endpoints.get(instance)
+            if endpoint is None:
+                endpoint = self._endpoints[instance] = Endpoint(instance, info)
+            endpoint.info = info
+            alive.append(endpoint)
+        if not alive:
+            if self.root not in self._endpoints:
+                self.root.mkdir(exist_ok=True)
+                self._endpoints[self.root] = Endpoint(self.root)
+            alive = [self._endpoints[self.root]]
+        self._alive, self._scanned = alive, now
+        return alive
+
+    def for_session(self, session_key) -> Endpoint:
+        with self._mutex:
+            alive = self._discover()
+            endpoint = self._sessions.get(session_key)
+            if endpoint not in alive:
+                load = {id(e): 0 for e in alive}
+                for e in self._sessions.values():
+                    if id(e) in load:
+                        load[id(e)] += 1
+                endpoint = min(alive, key=lambda e: load[id(e)])
+                self._sessions[session_key] = endpoint
+            return endpoint
+
+    def job_endpoints(self, caller: Endpoint = None) -> list:
+        """
+        Endpoints parallel jobs may use: those no session is bound to, or if
+        every instance has a session, all of them with the caller's own last.
+        """
+        with self._mutex:
+            return self._job_endpoints(caller)
+
+    def _job_endpoints(self, caller: Endpoint) -> list:
+        alive = self._discover()
+        bound = [id(e) for e in self._sessions.values()]
+        free = [e for e in alive if id(e) not in bound]
+        return free or sorted(alive, key=lambda e: e is caller)
+
+    def acquire(self, caller: Endpoint = None, timeout: float = None) -> Endpoint:
+        """Lock and return an idle job endpoint, waiting for one if all are busy"""
+        deadline = None if timeout is None else time.time() + timeout
+        with self._idle:
+            while True:
+                for endpoint in self._job_endpoints(caller):
+                    if endpoint.lock.acquire(blocking=False):
+                        return endpoint
+                remaining = None if deadline is None else deadline - time.time()
+                if remaining is not None and remaining <= 0:
+                    raise Exception("No idle Fusion instance")
+                # Session calls release locks without notifying, so poll as well
+                self._idle.wait(0.05 if remaining is None else min(0.05, remaining))
+
+    def release(self, endpoint: Endpoint):
+        endpoint.lock.release()
+        with self._idle:
+            self._idle.notify()
+
+pool = EndpointPool(COMM_DIR)
+
+def _session_key():
+    """Identify the calling MCP session (stdio servers only ever see one)"""
+    try:
+        return id(mcp.get_context().session)
+    except Exception:  # also covers mcp not built yet
+        return None
 
 # =============================================================================
 # BATCH OPERATIONS
 # =============================================================================
 
-@mcp.tool()
+@tool
 def batch(commands: list) -> dict:
     """
     Execute multiple Fusion commands in a single call - MUCH faster for complex operations.
@@ -85,11 +655,68 @@ def batch(commands: list) -> dict:
     """
     return send_fusion_command("batch", {"commands": commands})
 
+# =============================================================================
+# PARALLEL JOBS (multiple Fusion instances)
+# =============================================================================
+
+def _run_job(commands: list, caller: Endpoint = None) -> dict:
+    endpoint = pool.acquire(caller)
+    try:
+        results = []
+        for command in commands:
+            try:
+                results.append(endpoint.send(command["name"], command.get("params", {})))
+            except Exception as e:
+                return {"instance": endpoint.name, "results": results, "error": str(e)}
+        return {"instance": endpoint.name, "results": results}
+    finally:
+        pool.release(endpoint)
+
+@tool
+def run_parallel(jobs: list) -> dict:
+    """
+    Run independent jobs in parallel, one Fusion instance per job at a time.
+    
+    Each job is a list of commands in batch() format, executed in order on a
+    single instance, in whatever document is active there. Jobs are spread
+    over the instances no MCP session is working in, so they never touch
+    your design. Only when every instance has a session do they use those
+    instances, yours last - their bodies then end up in that document. With
+    one instance they simply run one after another in your document.
+    
+    Example: run_parallel([
+        [{"name": "create_sketch", "params": {"plane": "XY"}},
+         {"name": "draw_circle", "params": {"center_x": 0, "center_y": 0, "radius": 1}},
+         {"name": "finish_sketch", "params": {}},
+         {"name": "extrude", "params": {"distance": 2}},
+         {"name": "export_step", "params": {"filepath": "C:/out/variant_a.step"}}],
+        [... variant B ...]
+    ])
+    
+    Returns one entry per job with the instance used, per-command results,
+    and an "error" if the job stopped early.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    caller = pool.for_session(_session_key())
+    workers = max(1, min(len(jobs), len(pool.job_endpoints(caller))))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return {"success": True, "jobs": list(executor.map(lambda job: _run_job(job, caller), jobs))}
+
+@tool
+def list_fusion_instances() -> dict:
+    """List the Fusion 360 instances (add-in endpoints) this server can route to"""
+    current = pool.for_session(_session_key())
+    return {"success": True, "instances": [
+        {"name": e.name, "path": str(e.path), "document": e.info.get("document"),
+         "current_session": e is current, "busy": e.lock.locked()}
+        for e in pool.endpoints()
+    ]}
+
 # =============================================================================
 # SKETCH CREATION (ENHANCED)
 # =============================================================================
 
-@mcp.tool()
+@tool
 def create_sketch(plane: str, offset: float = 0) -> dict:
     """
     Create a new sketch on a construction plane (XY, XZ, or YZ) and enter edit mode.
@@ -104,7 +731,7 @@ def create_sketch(plane: str, offset: float = 0) -> dict:
     """
     return send_fusion_command("create_sketch", {"plane": plane, "offset": offset})
 
-@mcp.tool()
+@tool
 def finish_sketch() -> dict:
     """Exit sketch editing mode"""
     return send_fusion_command("finish_sketch", {})
@@ -113,22 +740,22 @@ def finish_sketch() -> dict:
 # SKETCH GEOMETRY
 # =============================================================================
 
-@mcp.tool()
+@tool
 def draw_rectangle(x1: float, y1: float, x2: float, y2: float) -> dict:
     """Draw a rectangle in the active sketch (units: cm)"""
     return send_fusion_command("draw_rectangle", {"x1": x1, "y1": y1, "x2": x2, "y2": y2})
 
-@mcp.tool()
+@tool
 def draw_circle(center_x: float, center_y: float, radius: float) -> dict:
     """Draw a circle in the active sketch (units: cm)"""
     return send_fusion_command("draw_circle", {"center_x": center_x, "center_y": center_y, "radius": radius})
 
-@mcp.tool()
+@tool
 def draw_line(x1: float, y1: float, x2: float, y2: float) -> dict:
     """Draw a straight line in the active sketch (units: cm)"""
     return send_fusion_command("draw_line", {"x1": x1, "y1": y1, "x2": x2, "y2": y2})
 
-@mcp.tool()
+@tool
 def draw_arc(center_x: float, center_y: float, start_x: float, start_y: float, end_x: float, end_y: float) -> dict:
     """Draw an arc in the active sketch (units: cm)"""
     return send_fusion_command("draw_arc", {
@@ -137,7 +764,7 @@ def draw_arc(center_x: float, center_y: float, start_x: float, start_y: float, e
         "end_x": end_x, "end_y": end_y
     })
 
-@mcp.tool()
+@tool
 def draw_polygon(center_x: float, center_y: float, radius: float, sides: int = 6) -> dict:
     """Draw a regular polygon in the active sketch (units: cm). Default is hexagon."""
     return send_fusion_command("draw_polygon", {
@@ -149,7 +776,7 @@ def draw_polygon(center_x: float, center_y: float, radius: float, sides: int = 6
 # 3D FEATURE OPERATIONS (ENHANCED)
 # =============================================================================
 
-@mcp.tool()
+@tool
 def extrude(distance: float, profile_index: int = 0, taper_angle: float = 0) -> dict:
     """
     Extrude the most recent sketch profile (units: cm).
@@ -165,12 +792,12 @@ def extrude(distance: float, profile_index: int = 0, taper_angle: float = 0) ->
         "taper_angle": taper_angle
     })
 
-@mcp.tool()
+@tool
 def revolve(angle: float) -> dict:
     """Revolve the most recent sketch profile around an axis (degrees)"""
     return send_fusion_command("revolve", {"angle": angle})
 
-@mcp.tool()
+@tool
 def fillet(radius: float, edges: list = None, body_index: int = None) -> dict:
     """
     Add fillets to edges of a body (units: cm).
@@ -189,7 +816,7 @@ def fillet(radius: float, edges: list = None, body_index: int = None) -> dict:
         params["body_index"] = body_index
     return send_fusion_command("fillet", params)
 
-@mcp.tool()
+@tool
 def chamfer(distance: float, edges: list = None, body_index: int = None) -> dict:
     """
     Add chamfers to edges of a body (units: cm).
@@ -212,7 +839,7 @@ def chamfer(distance: float, edges: list = None, body_index: int = None) -> dict
 # NEW: SHELL, DRAFT, PATTERNS, MIRROR
 # =============================================================================
 
-@mcp.tool()
+@tool
 def shell(thickness: float, faces_to_remove: list = None, body_index: int = None) -> dict:
     """
     Create a hollow shell from a solid body (units: cm).
@@ -235,7 +862,7 @@ def shell(thickness: float, faces_to_remove: list = None, body_index: int = None
         params["body_index"] = body_index
     return send_fusion_command("shell", params)
 
-@mcp.tool()
+@tool
 def draft(angle: float, faces: list = None, body_index: int = None, 
           pull_x: float = 0, pull_y: float = 0, pull_z: float = 1) -> dict:
     """
@@ -254,10 +881,10 @@ def draft(angle: float, faces: list = None, body_index: int = None,
         params["body_index"] = body_index
     return send_fusion_command("draft", params)
 
-@mcp.tool()
+@tool
 def pattern_rectangular(x_count: int, x_spacing: float, 
                         y_count: int = 1, y_spacing: float = 0, 
-                        body_index: int = None) -> dict:
+                        body_index: int = None, mode: str = "auto") -> dict:
     """
     Create a rectangular (linear) pattern of a body (spacing in cm).
     
@@ -267,18 +894,23 @@ def pattern_rectangular(x_count: int, x_spacing: float,
         y_count: Number of instances in Y direction (default 1)
         y_spacing: Spacing between instances in Y
         body_index: Which body (default: most recent)
+        mode: "feature" (Fusion pattern feature), "expanded" (copies placed from
+              server-computed transforms in one call) or "auto" (expanded from
+              50 instances, e.g. vent grids and perforated plates)
     
     Example:
         pattern_rectangular(x_count=4, x_spacing=2.5, y_count=3, y_spacing=2.5)
         # Creates 4x3 = 12 instances
     """
-    params = {"x_count": x_count, "x_spacing": x_spacing, "y_count": y_count, "y_spacing": y_spacing}
+    params = {"x_count": x_count, "x_spacing": x_spacing, "y_count": y_count, "y_spacing": y_spacing,
+              "mode": mode}
     if body_index is not None:
         params["body_index"] = body_index
     return send_fusion_command("pattern_rectangular", params)
 
-@mcp.tool()
-def pattern_circular(count: int, angle: float = 360, axis: str = "Z", body_index: int = None) -> dict:
+@tool
+def pattern_circular(count: int, angle: float = 360, axis: str = "Z", body_index: int = None,
+                     mode: str = "auto") -> dict:
     """
     Create a circular (radial) pattern of a body.
     
@@ -287,26 +919,28 @@ def pattern_circular(count: int, angle: float = 360, axis: str = "Z", body_index
         angle: Total angle in degrees (default 360 for full circle)
         axis: Rotation axis - "X", "Y", or "Z" (default "Z")
         body_index: Which body (default: most recent)
+        mode: "feature", "expanded" or "auto" (see pattern_rectangular)
     
     Example:
         pattern_circular(count=6, angle=360, axis="Z")
         # 6 instances evenly spaced around Z axis
     """
-    params = {"count": count, "angle": angle, "axis": axis}
+    params = {"count": count, "angle": angle, "axis": axis, "mode": mode}
     if body_index is not None:
         params["body_index"] = body_index
     return send_fusion_command("pattern_circular", params)
 
-@mcp.tool()
-def mirror(plane: str = "YZ", body_index: int = None) -> dict:
+@tool
+def mirror(plane: str = "YZ", body_index: int = None, mode: str = "auto") -> dict:
     """
     Create a mirrored copy of a body.
     
     Args:
         plane: Mirror plane - "XY", "XZ", or "YZ" (default "YZ" for left-right symmetry)
         body_index: Which body (default: most recent)
+        mode: "feature", "expanded" or "auto" (a single copy, so auto uses the feature)
     """
-    params = {"plane": plane}
+    params = {"plane": plane, "mode": mode}
     if body_index is not None:
         params["body_index"] = body_index
     return send_fusion_command("mirror", params)
@@ -315,12 +949,124 @@ def mirror(plane: str = "YZ", body_index: int = None) -> dict:
 # VIEW & DESIGN INFO
 # =============================================================================
 
-@mcp.tool()
+@tool
 def fit_view() -> dict:
     """Fit the viewport to show all geometry"""
     return send_fusion_command("fit_view", {})
 
-@mcp.tool()
+# Captures are cached per endpoint under the add-in's key (document, design
+# revision, camera, size) and compared by perceptual hash, so re-capturing an
+# unchanged view costs neither a render nor image tokens. Pillow is optional:
+# without it only byte-identical images count as unchanged.
+VIEW_CACHE_SIZE = 32
+IMAGE_FORMATS = ("png", "jpg")
+CAPTURE_MODES = ("image", "base64", "file")
+
+class ViewCache:
+    """Recent captures of one Fusion instance, most recently used last"""
+
+    def __init__(self):
+        self.images = {}          # key -> {"data": bytes, "hash": str}
+        self.last_seen = {}       # session key -> (revision, hash) of the last image it was sent
+
+    def get(self, key: str) -> dict:
+        entry = self.images.pop(key)
+        self.images[key] = entry
+        return entry
+
+    def put(self, key: str, data: bytes) -> dict:
+        entry = self.images[key] = {"data": data, "hash": perceptual_hash(data)}
+        while len(self.images) > VIEW_CACHE_SIZE:
+            del self.images[next(iter(self.images))]
+        return entry
+
+def perceptual_hash(data: bytes) -> str:
+    """64-bit difference hash (dHash) of an image, or a SHA-1 without Pillow"""
+    try:
+        import io
+        from PIL import Image as PILImage
+    except ImportError:
+        import hashlib
+        return "sha1:" + hashlib.sha1(data).hexdigest()
+    pixels = PILImage.open(io.BytesIO(data)).convert("L").resize((9, 8)).tobytes()
+    bits = 0
+    for row in range(8):
+        for col in range(8):
+            bits = bits << 1 | (pixels[row * 9 + col] > pixels[row * 9 + col + 1])
+    return f"dhash:{bits:016x}"
+
+def hash_distance(a: str, b: str) -> int:
+    if a.startswith("dhash:") and b.startswith("dhash:"):
+        return bin(int(a[6:], 16) ^ int(b[6:], 16)).count("1")
+    return 0 if a == b else 64
+
+@tool
+def capture_view(width: int = 800, height: int = 600, format: str = "png",
+                 return_mode: str = "image", filepath: str = None,
+                 force: bool = False, change_threshold: int = 4):
+    """
+    Capture the active viewport for visual verification.
+    
+    Args:
+        width, height: Image size in pixels (default 800x600; use less for quick checks)
+        format: "png" or "jpg"
+        return_mode: "image" (MCP image content), "base64" (string in the result),
+                     or "file" (saved to filepath, nothing returned in memory)
+        filepath: Output path for return_mode="file"
+        force: Always render and return the image
+        change_threshold: Max perceptual-hash bit difference (of 64) still
+                          treated as unchanged (default 4)
+    
+    If the design has not changed and the view looks the same as the last
+    image this session was sent, the result has changed=False and no image.
+    Any design edit always returns the image, however small the visual
+    difference. Renders are cached per design revision and camera, so
+    repeating a view does not re-render.
+    """
+    if format not in IMAGE_FORMATS:
+        raise ValueError(f"format must be one of {IMAGE_FORMATS}, got {format!r}")
+    if return_mode not in CAPTURE_MODES:
+        raise ValueError(f"return_mode must be one of {CAPTURE_MODES}, got {return_mode!r}")
+    if width <= 0 or height <= 0:
+        raise ValueError(f"width and height must be positive, got {width}x{height}")
+    params = {"width": width, "height": height, "format": format}
+    if return_mode == "file":
+        if not filepath:
+            raise ValueError("return_mode='file' needs a filepath")
+        return send_fusion_command("capture_view", dict(params, filepath=filepath))
+
+    session = _session_key()
+    endpoint = pool.for_session(session)
+    with endpoint.lock:
+        views = endpoint.views
+        params["cached_keys"] = [] if force else list(views.images)
+        result = endpoint.send("capture_view", params)
+        key = result["key"]
+        revision = result.get("revision", key)
+        if result.get("cached"):
+            entry = views.get(key)
+        else:
+            entry = views.put(key, base64.b64decode(result["image"]))
+        # The perceptual hash only absorbs camera/render noise; a design edit
+        # (a small hole, a fillet) may be invisible to an 8x9 dHash
+        last = views.last_seen.get(session)
+        unchanged = (not force and last is not None and last[0] == revision
+                     and hash_distance(entry["hash"], last[1]) <= change_threshold)
+        if not unchanged:
+            views.last_seen[session] = (revision, entry["hash"])
+
+    info = {"success": True, "changed": not unchanged, "key": key, "hash": entry["hash"]}
+    if unchanged:
+        info["message"] = "View unchanged since the last capture - image omitted"
+        return info
+    info.update(width=width, height=height, format=format)
+    if return_mode == "base64":
+        info["image"] = base64.b64encode(entry["data"]).decode("ascii")
+        return info
+    from mcp.server.fastmcp import Image
+    return [info, Image(data=entry["data"], format="jpeg" if format == "jpg" else format)]
+
+@tool
 def get_design_info() -> dict:
     """Get information about the current design (name, body count, sketch count, component count, active sketch status)"""
     return send_fusion_command("get_design_info", {})
@@ -329,23 +1075,42 @@ def get_design_info() -> dict:
 # NEW: MEASUREMENT & INSPECTION
 # =============================================================================
 
-@mcp.tool()
-def get_body_info(body_index: int = None) -> dict:
+@tool
+def get_body_info(body_index: int = None, fields: list = None, filters: dict = None,
+                  include: list = None, cursor: int = None, limit: int = None,
+                  columnar: bool = False) -> dict:
     """
-    Get detailed information about a body including all edges and faces.
+    Get detailed information about a body's edges and faces.
     
     Args:
         body_index: Which body (default: most recent)
+        fields: Fields to return. Default edges: index, length; faces: index, area.
+                Edges: index, length, type, start, end
+                Faces: index, area, type, normal, centroid, edge_count
+        filters: Field conditions - a value for equality or {"min", "max", "contains"}
+        include: ["edges"], ["faces"] or both (default)
+        cursor: Offset to resume from (next_cursor of the previous page)
+        limit: Maximum edges/faces per page
+        columnar: Return {field: [values...]} instead of a list of dicts
     
-    Returns edge indices with lengths, face indices with areas.
-    Use this to find indices for selective fillet, chamfer, shell, or draft.
+    Examples:
+        get_body_info(fields=["area", "normal"], filters={"type": "Plane"})
+        get_body_info(include=["edges"], filters={"length": {"max": 0.5}}, limit=50)
+    
+    "index" is always returned and refers to the unfiltered body, so it can be
+    passed to fillet, chamfer, shell, or draft. Fields and filters must name
+    the same section (edge or face) or the call fails. On large filleted bodies, select fields
+    and page with limit/cursor instead of fetching everything.
     """
     params = {}
     if body_index is not None:
         params["body_index"] = body_index
+    params.update(_selection_params(fields, filters, cursor, limit, columnar))
+    if include is not None:
+        params["include"] = include
     return send_fusion_command("get_body_info", params)
 
-@mcp.tool()
+@tool
 def measure(type: str = "body", body_index: int = None, 
             edge_index: int = None, face_index: int = None) -> dict:
     """
@@ -371,11 +1136,62 @@ def measure(type: str = "body", body_index: int = None,
         params["face_index"] = face_index
     return send_fusion_command("measure", params)
 
+def _point_distance(query: dict) -> dict:
+    points = [query.get("p1"), query.get("p2")]
+    for name, point in zip(("p1", "p2"), points):
+        if (not isinstance(point, (list, tuple)) or len(point) != 3
+                or not all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in point)):
+            return {"error": f"point_distance: {name} must be [x, y, z] numbers, got {point!r}"}
+    delta = [b - a for a, b in zip(*points)]
+    return {"distance": math.sqrt(sum(d * d for d in delta)), "delta": delta}
+
+@tool
+def measure_many(queries: list, columnar: bool = False) -> dict:
+    """
+    Run many measurements in a single round-trip.
+    
+    Args:
+        queries: List of measurement dicts, each with a "type":
+            {"type": "body", "body_index": 0}
+            {"type": "edge", "body_index": 0, "edge_index": 3}
+            {"type": "face", "body_index": 0, "face_index": 1}
+            {"type": "point_distance", "p1": [0, 0, 0], "p2": [3, 4, 0]}
+            {"type": "min_distance", "component1_index": 0, "component2_index": 1}
+            {"type": "min_distance", "body1_index": 0, "body2_index": 1}
+        columnar: Return {field: [value per query...]} (None where a query has
+                  no such field) instead of a list of dicts
+    
+    Returns:
+        results: One entry per query, in order. A failed query has an "error"
+                 key instead of aborting the others.
+    
+    Body properties are cached per body revision in the add-in, so measuring
+    several edges/faces of the same body does not recompute mass properties.
+    point_distance is computed locally without contacting Fusion.
+    """
+    results = [None] * len(queries)
+    remote = []
+    for i, query in enumerate(queries):
+        if query.get("type") == "point_distance":
+            results[i] = _point_distance(query)
+        else:
+            remote.append(i)
+    if remote:
+        response = send_fusion_command("measure_many", {"queries": [queries[i] for i in remote]})
+        if len(response.get("results") or []) != len(remote):
+            raise Exception("Add-in did not return measure_many results - update the FusionMCP add-in")
+        for i, result in zip(remote, response["results"]):
+            results[i] = result
+    if columnar:
+        fields = list(dict.fromkeys(key for result in results for key in result))
+        results = {f: [result.get(f) for result in results] for f in fields}
+    return {"success": True, "results": results}
+
 # =============================================================================
 # COMPONENT & ASSEMBLY
 # =============================================================================
 
-@mcp.tool()
+@tool
 def create_component(name: str = None) -> dict:
     """Convert the most recent body into a new component for assembly"""
     params = {}
@@ -383,12 +1199,24 @@ def create_component(name: str = None) -> dict:
         params["name"] = name
     return send_fusion_command("create_component", params)
 
-@mcp.tool()
-def list_components() -> dict:
-    """List all components with names, positions, and bounding boxes"""
-    return send_fusion_command("list_components", {})
+@tool
+def list_components(fields: list = None, filters: dict = None, cursor: int = None,
+                    limit: int = None, columnar: bool = False) -> dict:
+    """
+    List components with names, positions, and bounding boxes.
+    
+    Args:
+        fields: Fields to return - index, name, position, bounding_box, body_count
+                (default: index, name, position, bounding_box)
+        filters: Field conditions, e.g. {"name": {"contains": "bracket"}}
+        cursor: Offset to resume from (next_cursor of the previous page)
+        limit: Maximum components per page
+        columnar: Return {field: [values...]} instead of a list of dicts
+    """
+    return send_fusion_command("list_components",
+                               _selection_params(fields, filters, cursor, limit, columnar))
 
-@mcp.tool()
+@tool
 def delete_component(name: str = None, index: int = None) -> dict:
     """Delete a component by name or index"""
     params = {}
@@ -398,7 +1226,7 @@ def delete_component(name: str = None, index: int = None) -> dict:
         params["index"] = index
     return send_fusion_command("delete_component", params)
 
-@mcp.tool()
+@tool
 def check_interference() -> dict:
     """Check if any components overlap (bounding box collision detection)"""
     return send_fusion_command("check_interference", {})
@@ -407,7 +1235,7 @@ def check_interference() -> dict:
 # NEW: COMPONENT POSITIONING (CRITICAL)
 # =============================================================================
 
-@mcp.tool()
+@tool
 def move_component(x: float = 0, y: float = 0, z: float = 0,
                    index: int = None, name: str = None, 
                    absolute: bool = True) -> dict:
@@ -433,7 +1261,7 @@ def move_component(x: float = 0, y: float = 0, z: float = 0,
         params["name"] = name
     return send_fusion_command("move_component", params)
 
-@mcp.tool()
+@tool
 def rotate_component(angle: float, axis: str = "Z",
                      index: int = None, name: str = None,
                      origin_x: float = 0, origin_y: float = 0, origin_z: float = 0) -> dict:
@@ -461,7 +1289,7 @@ def rotate_component(angle: float, axis: str = "Z",
 # JOINTS
 # =============================================================================
 
-@mcp.tool()
+@tool
 def create_revolute_joint(
     component1_index: int = None,
     component2_index: int = None,
@@ -482,7 +1310,7 @@ def create_revolute_joint(
         params["max_angle"] = max_angle
     return send_fusion_command("create_revolute_joint", params)
 
-@mcp.tool()
+@tool
 def create_slider_joint(
     component1_index: int = None,
     component2_index: int = None,
@@ -502,7 +1330,7 @@ def create_slider_joint(
         params["max_distance"] = max_distance
     return send_fusion_command("create_slider_joint", params)
 
-@mcp.tool()
+@tool
 def set_joint_angle(angle: float, joint_index: int = None) -> dict:
     """Animate a revolute joint to a specific angle (degrees)"""
     params = {"angle": angle}
@@ -510,7 +1338,7 @@ def set_joint_angle(angle: float, joint_index: int = None) -> dict:
         params["joint_index"] = joint_index
     return send_fusion_command("set_joint_angle", params)
 
-@mcp.tool()
+@tool
 def set_joint_distance(distance: float, joint_index: int = None) -> dict:
     """Animate a slider joint to a specific distance (cm)"""
     params = {"distance": distance}
@@ -522,7 +1350,7 @@ def set_joint_distance(distance: float, joint_index: int = None) -> dict:
 # BOOLEAN OPERATIONS (v7.1 - Added combine)
 # =============================================================================
 
-@mcp.tool()
+@tool
 def combine(target_body: int, tool_bodies: list, operation: str = "cut", keep_tools: bool = False) -> dict:
     """
     Boolean operations: cut, join, or intersect bodies.
@@ -549,7 +1377,7 @@ def combine(target_body: int, tool_bodies: list, operation: str = "cut", keep_to
 # UTILITY OPERATIONS (v7.2 - undo, delete_body, delete_sketch)
 # =============================================================================
 
-@mcp.tool()
+@tool
 def undo(count: int = 1) -> dict:
     """
     Undo recent operations.
@@ -562,7 +1390,7 @@ def undo(count: int = 1) -> dict:
     """
     return send_fusion_command("undo", {"count": count})
 
-@mcp.tool()
+@tool
 def delete_body(body_index: int = None) -> dict:
     """
     Delete a body by index.
@@ -577,7 +1405,7 @@ def delete_body(body_index: int = None) -> dict:
         params["body_index"] = body_index
     return send_fusion_command("delete_body", params)
 
-@mcp.tool()
+@tool
 def delete_sketch(sketch_index: int = None) -> dict:
     """
     Delete a sketch by index.
@@ -595,17 +1423,17 @@ def delete_sketch(sketch_index: int = None) -> dict:
 # EXPORT
 # =============================================================================
 
-@mcp.tool()
+@tool
 def export_stl(filepath: str) -> dict:
     """Export the design as STL file for 3D printing"""
     return send_fusion_command("export_stl", {"filepath": filepath})
 
-@mcp.tool()
+@tool
 def export_step(filepath: str) -> dict:
     """Export the design as STEP file (CAD standard)"""
     return send_fusion_command("export_step", {"filepath": filepath})
 
-@mcp.tool()
+@tool
 def export_3mf(filepath: str) -> dict:
     """Export the design as 3MF file (modern 3D printing format)"""
     return send_fusion_command("export_3mf", {"filepath": filepath})
@@ -614,14 +1442,165 @@ def export_3mf(filepath: str) -> dict:
 # IMPORT
 # =============================================================================
 
-@mcp.tool()
+@tool
 def import_mesh(filepath: str, unit: str = "mm") -> dict:
     """Import STL, OBJ, or 3MF mesh file. Units: mm, cm, or in"""
     return send_fusion_command("import_mesh", {"filepath": filepath, "unit": unit})
 
 # =============================================================================
-# MAIN
+# STARTUP
 # =============================================================================
+# The process answers initialize, tools/list and the other listing requests
+# itself from a schema cache, without importing the mcp package. FastMCP is
+# built in a background thread meanwhile; the first request that needs it
+# (normally tools/call) hands stdin/stdout over to FastMCP, replaying the
+# initialize handshake so its session state is consistent.
+# The cache is rebuilt whenever this file or the mcp package changes.
+# Measure with: python bench.py startup
+
+SCHEMA_CACHE = COMM_DIR / "tool_schema_cache.json"
+HANDOFF_ID = "lazy-startup-initialize"
+_server_lock = threading.Lock()
+
+def create_server():
+    """Import FastMCP and register every tool (the slow part of startup)"""
+    global mcp
+    with _server_lock:
+        if mcp is None:
+            from mcp.server.fastmcp import FastMCP
+            server = FastMCP(SERVER_NAME)
+            for fn in TOOLS:
+                server.add_tool(fn)
+            mcp = server
+    return mcp
+
+def _cache_key() -> str:
+    """Changes whenever this file or the installed mcp package changes"""
+    import hashlib
+    import importlib.util
+    spec = importlib.util.find_spec("mcp")
+    mcp_stamp = Path(spec.origin).stat().st_mtime if spec and spec.origin else 0
+    return f"{hashlib.sha1(Path(__file__).read_bytes()).hexdigest()}-{mcp_stamp}"
+
+def _load_schema_cache(key: str):
+    try:
+        with open(SCHEMA_CACHE, 'r') as f:
+            cache = json.load(f)
+        return cache if cache.get("key") == key else None
+    except (OSError, ValueError):
+        return None
+
+def _build_schema_cache(key: str) -> dict:
+    """Introspect the registered tools once and store the listing responses"""
+    import asyncio
+    import mcp.types as types
+    try:
+        from mcp.shared.version import SUPPORTED_PROTOCOL_VERSIONS
+    except ImportError:
+        SUPPORTED_PROTOCOL_VERSIONS = [types.LATEST_PROTOCOL_VERSION]
+    server = create_server()
+    options = server._mcp_server.create_initialization_options()
+    dump = lambda model: model.model_dump(mode="json", by_alias=True, exclude_none=True)
+    cache = {
+        "key": key,
+        "protocol_versions": list(SUPPORTED_PROTOCOL_VERSIONS),
+        "latest_protocol_version": types.LATEST_PROTOCOL_VERSION,
+        "initialize": {
+            "capabilities": dump(options.capabilities),
+            "serverInfo": {"name": options.server_name, "version": options.server_version},
+        },
+        "results": {
+            "tools/list": {"tools": [dump(t) for t in asyncio.run(server.list_tools())]},
+            "resources/list": {"resources": [dump(r) for r in asyncio.run(server.list_resources())]},
+            "resources/templates/list": {"resourceTemplates": [
+                dump(r) for r in asyncio.run(server.list_resource_templates())]},
+            "prompts/list": {"prompts": [dump(p) for p in asyncio.run(server.list_prompts())]},
+            "ping": {},
+        },
+    }
+    if options.instructions:
+        cache["initialize"]["instructions"] = options.instructions
+    try:
+        SCHEMA_CACHE.parent.mkdir(exist_ok=True)
+        tmp = SCHEMA_CACHE.with_suffix(".tmp")
+        with open(tmp, 'w') as f:
+            json.dump(cache, f)
+        tmp.replace(SCHEMA_CACHE)
+    except OSError:
+        pass  # read-only home: just rebuild next launch
+    return cache
+
+class _ReplayStdin:
+    """stdin for FastMCP: the replayed handshake first, then the real stream"""
+
+    def __init__(self, lines: list):
+        self.lines = lines
+
+    def readline(self) -> str:
+        if self.lines:
+            return self.lines.pop(0)
+        return sys.stdin.buffer.readline().decode("utf-8")
+
+class _FilteredStdout:
+    """stdout for FastMCP that drops its reply to the replayed initialize"""
+
+    def write(self, text: str) -> int:
+        if HANDOFF_ID not in text or json.loads(text).get("id") != HANDOFF_ID:
+            sys.stdout.buffer.write(text.encode("utf-8"))
+        return len(text)
+
+    def flush(self):
+        sys.stdout.buffer.flush()
+
+def _hand_off(replay: list):
+    """Run FastMCP on stdio, starting with the replayed messages"""
+    # Wait for the warm-up thread before importing anything from mcp here,
+    # otherwise the two threads deadlock on the package import locks
+    server = create_server()._mcp_server
+    import anyio
+    from mcp.server.stdio import stdio_server
+
+    async def serve():
+        stdin, stdout = anyio.wrap_file(_ReplayStdin(replay)), anyio.wrap_file(_FilteredStdout())
+        async with stdio_server(stdin=stdin, stdout=stdout) as (read_stream, write_stream):
+            await server.run(read_stream, write_stream, server.create_initialization_options())
+
+    anyio.run(serve)
+
+def _reply(message_id, result: dict):
+    sys.stdout.buffer.write(json.dumps({"jsonrpc": "2.0", "id": message_id, "result": result}).encode("utf-8") + b"\n")
+    sys.stdout.buffer.flush()
+
+def serve():
+    key = _cache_key()
+    cache = _load_schema_cache(key) or _build_schema_cache(key)
+    # Warm up FastMCP while the client is still handshaking
+    threading.Thread(target=create_server, daemon=True).start()
+    replay = []
+    while True:
+        line = sys.stdin.buffer.readline()
+        if not line:
+            return
+        try:
+            message = json.loads(line)
+        except ValueError:
+            message = {}
+        method = message.get("method")
+        if method == "initialize":
+            requested = message.get("params", {}).get("protocolVersion")
+            version = requested if requested in cache["protocol_versions"] else cache["latest_protocol_version"]
+            _reply(message["id"], dict(cache["initialize"], protocolVersion=version))
+            handshake = dict(message, id=HANDOFF_ID)
+            replay.append(json.dumps(handshake) + "\n")
+        elif method == "notifications/initialized":
+            replay.append(line.decode("utf-8"))
+        elif method in cache["results"] and "id" in message:
+            _reply(message["id"], cache["results"][method])
+        elif method and method.startswith("notifications/"):
+            continue  # nothing to cancel or update before FastMCP exists
+        else:
+            replay.append(line.decode("utf-8"))
+            return _hand_off(replay)
 
 if __name__ == "__main__":
-    mcp.run()
+    serve()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Mock FusionMCP add-in for exercising the server without Fusion 360.
+====================================================================
+Serves one instance directory exactly like the real add-in (command files
+in, response files out, endpoint.json heartbeat) and answers every command
+with success after an artificial delay. Run several to test routing and
+run_parallel on a single host:
+
+    python mock_addin.py --name a &
+    python mock_addin.py --name b --delay 0.5 &
+
+Use --root to point at a scratch directory (the server uses
+~/fusion_mcp_comm, so set HOME for the server to match).
+"""
+import argparse
+import base64
+import json
+import os
+import signal
+import sys
+import struct
+import threading
+import time
+import zlib
+from pathlib import Path
+
+def write_json(path: Path, data: dict):
+    tmp = path.with_suffix('.tmp')
+    with open(tmp, 'w') as f:
+        json.dump(data, f, separators=(',', ':'))
+    os.replace(tmp, path)
+
+def png(width: int, height: int, revision: int) -> bytes:
+    """Dark greyscale PNG with a bright vertical bar that moves with the revision"""
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+    bar_width = max(1, width // 8)
+    bar_start = (revision * bar_width) % width
+    row = bytes(255 if bar_start <= x < bar_start + bar_width else 32 for x in range(width))
+    rows = b"".join(b"\0" + row for _ in range(height))
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 0, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(rows)) + chunk(b"IEND", b""))
+
+def answer(name: str, command: dict, counters: dict) -> dict:
+    tool = command.get("name")
+    params = command.get("params", {})
+    if tool == "capture_view":
+        revision = f"{name}|{counters['bodies']}"
+        key = f"{revision}|{params['width']}x{params['height']}.{params['format']}"
+        if key in params.get("cached_keys", []):
+            return {"success": True, "key": key, "revision": revision, "cached": True}
+        image = png(params["width"], params["height"], counters["bodies"])
+        return {"success": True, "key": key, "revision": revision,
+                "image": base64.b64encode(image).decode("ascii")}
+    if tool == "get_design_info":
+        return {"success": True, "design_name": f"mock-{name}",
+                "body_count": counters["bodies"], "sketch_count": counters["sketches"]}
+    if tool == "create_sketch":
+        counters["sketches"] += 1
+    elif tool in ("extrude", "revolve"):
+        counters["bodies"] += 1
+    return {"success": True, "instance": name, "tool": tool}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--name", default=str(os.getpid()), help="instance directory name")
+    parser.add_argument("--root", type=Path, default=Path.home() / "fusion_mcp_comm")
+    parser.add_argument("--delay", type=float, default=0.1, help="seconds per command")
+    parser.add_argument("--heartbeat", type=float, default=5, help="seconds between endpoint.json refreshes")
+    args = parser.parse_args()
+
+    instance_dir = args.root / "instances" / args.name
+    instance_dir.mkdir(parents=True, exist_ok=True)
+    heartbeat = instance_dir / "endpoint.json"
+    counters = {"bodies": 0, "sketches": 0}
+    print(f"Mock add-in '{args.name}' listening at {instance_dir}")
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+
+    stopped = threading.Event()
+
+    def beat():
+        # Separate thread, like the add-in, so slow commands keep the instance alive
+        while True:
+            write_json(heartbeat, {"pid": os.getpid(), "document": f"mock-{args.name}",
+                                   "updated": time.time()})
+            if stopped.wait(args.heartbeat):
+                return
+
+    beater = threading.Thread(target=beat, daemon=True)
+    beater.start()
+    try:
+        while True:
+            for cmd_file in instance_dir.glob("command_*.json"):
+                try:
+                    with open(cmd_file, 'r') as f:
+                        command = json.load(f)
+                except (OSError, ValueError):
+                    continue
+                resp_file = instance_dir / f"response_{command['id']}.json"
+                if resp_file.exists():
+                    continue
+                time.sleep(args.delay)
+                write_json(resp_file, answer(args.name, command, counters))
+            time.sleep(0.02)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stopped.set()
+        beater.join()
+        heartbeat.unlink(missing_ok=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Instance routing against mock_addin.py - no Fusion 360 needed.
+==============================================================
+    python -m pytest -q test_routing.py
+
+Each test starts its own mock add-ins in a scratch HOME and routes through
+a fresh EndpointPool, with timeouts shortened so crashes show up in seconds.
+"""
+import os
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent))
+import fusion360_mcp_server as server
+
+MOCK = Path(__file__).with_name("mock_addin.py")
+HEARTBEAT_TIMEOUT = 1.5
+
+PART = [
+    {"name": "create_sketch", "params": {"plane": "XY"}},
+    {"name": "draw_circle", "params": {"center_x": 0, "center_y": 0, "radius": 1}},
+    {"name": "finish_sketch", "params": {}},
+    {"name": "extrude", "params": {"distance": 2}},
+]
+
+@pytest.fixture
+def comm(tmp_path, monkeypatch):
+    """(pool, start) - start(name, delay) launches a mock add-in and waits for its heartbeat"""
+    root = tmp_path / "fusion_mcp_comm"
+    root.mkdir()
+    monkeypatch.setattr(server, "HEARTBEAT_TIMEOUT", HEARTBEAT_TIMEOUT)
+    monkeypatch.setattr(server, "DISCOVERY_INTERVAL", 0)
+    pool = server.EndpointPool(root)
+    monkeypatch.setattr(server, "pool", pool)
+    mocks = {}
+
+    def start(name, delay=0.05):
+        mocks[name] = subprocess.Popen(
+            [sys.executable, str(MOCK), "--name", name, "--root", str(root),
+             "--delay", str(delay), "--heartbeat", "0.2"],
+            env=dict(os.environ, HOME=str(tmp_path)), stdout=subprocess.DEVNULL)
+        heartbeat = root / "instances" / name / "endpoint.json"
+        for _ in range(100):
+            if heartbeat.exists():
+                return mocks[name]
+            time.sleep(0.05)
+        raise RuntimeError(f"mock add-in {name} did not start")
+
+    yield pool, start
+    for proc in mocks.values():
+        proc.terminate()
+        proc.wait()
+
+def test_sessions_go_to_least_used_instance(comm):
+    pool, start = comm
+    start("a")
+    start("b")
+    first, second = pool.for_session("s1"), pool.for_session("s2")
+    assert {first.name, second.name} == {"a", "b"}
+    assert pool.for_session("s1") is first
+
+def test_session_stays_on_busy_instance(comm):
+    pool, start = comm
+    start("a", delay=HEARTBEAT_TIMEOUT * 2)
+    start("b")
+    endpoint = pool.for_session("s1")
+    busy = threading.Thread(target=lambda: endpoint.send("get_design_info", {}))
+    with endpoint.lock:
+        busy.start()
+        time.sleep(HEARTBEAT_TIMEOUT * 1.5)
+        assert endpoint in pool.endpoints()
+        assert pool.for_session("s1") is endpoint
+        busy.join()
+
+def test_falls_back_to_root_without_instances(comm):
+    pool, start = comm
+    assert pool.for_session("s1").path == pool.root
+    start("a")
+    assert pool.for_session("s1").name == "a"
+
+def test_run_parallel_spreads_jobs_outside_callers_instance(comm):
+    pool, start = comm
+    for name in ("a", "b", "c"):
+        start(name)
+    caller = pool.for_session(server._session_key())
+    result = server.run_parallel([PART] * 4)
+    assert all("error" not in job for job in result["jobs"])
+    assert {job["instance"] for job in result["jobs"]} == {"a", "b", "c"} - {caller.name}
+    assert server.get_design_info()["body_count"] == 0
+
+def test_run_parallel_uses_callers_instance_last(comm):
+    pool, start = comm
+    start("a")
+    result = server.run_parallel([PART] * 2)
+    assert [job["instance"] for job in result["jobs"]] == ["a", "a"]
+
+@pytest.mark.parametrize("pid_check", [True, False], ids=["pid", "heartbeat"])
+def test_crashed_instance_releases_its_sessions(comm, monkeypatch, pid_check):
+    pool, start = comm
+    procs = {name: start(name) for name in ("a", "b")}
+    if not pid_check:  # as on Windows, where only the heartbeat age is known
+        monkeypatch.setattr(server, "_pid_running", lambda pid: True)
+    crashed = pool.for_session("s1")
+    procs[crashed.name].kill()
+    procs[crashed.name].wait()
+    if not pid_check:
+        time.sleep(HEARTBEAT_TIMEOUT + 0.5)
+    moved = pool.for_session("s1")
+    assert moved is not crashed and moved.name in procs
+    assert [e.name for e in pool.endpoints()] == [moved.name]
+    assert (crashed.path / "endpoint.json").exists() != pid_check  # dead pid: directory removed